@@ -10,19 +10,18 @@ Data source: `airports.json` in the project root or in the PyInstaller bundle.
 
 from __future__ import annotations
 
-import json
+import sys
 import threading
-from dataclasses import dataclass
+from operator import attrgetter
 from pathlib import Path
 from typing import Dict, Iterable, List, Optional, Tuple
 
-from models import Airport
+import json_compat
+from models import Airport, flag_emoji_for
 
 
 def _resource_path(filename: str) -> Path:
     """Return a path to a data file for both dev and PyInstaller."""
-    import sys
-
     if hasattr(sys, "_MEIPASS"):
         base = Path(sys._MEIPASS)
     else:
@@ -30,15 +29,51 @@ def _resource_path(filename: str) -> Path:
     return base / filename
 
 
-@dataclass(frozen=True)
+# C-level sort keys for Airport lists (avoid a Python lambda call per element).
+_COUNTRY_CITY_IATA = attrgetter("country", "city", "iata")
+_CITY_IATA = attrgetter("city", "iata")
+
+_CONTINENT_EMOJIS: Dict[str, str] = {
+    'Africa': '🌍',
+    'Asia': '🌏',
+    'Europe': '🌍',
+    'North America': '🌎',
+    'South America': '🌎',
+    'Oceania': '🌏',
+    'Antarctica': '🧊',
+}
+
+
 class _AirportRecord:
-    iata: str
-    city: str
-    country: str
-    country_code: str
-    continent: str
-    airport_name: str = ""
-    commercial_flights: bool = True
+    """Raw airport row from airports.json (slotted: one per airport, never hashed)."""
+
+    __slots__ = (
+        "iata",
+        "city",
+        "country",
+        "country_code",
+        "continent",
+        "airport_name",
+        "commercial_flights",
+    )
+
+    def __init__(
+        self,
+        iata: str,
+        city: str,
+        country: str,
+        country_code: str,
+        continent: str,
+        airport_name: str = "",
+        commercial_flights: bool = True,
+    ):
+        self.iata = iata
+        self.city = city
+        self.country = country
+        self.country_code = country_code
+        self.continent = continent
+        self.airport_name = airport_name
+        self.commercial_flights = commercial_flights
 
     def to_model(self) -> Airport:
         return Airport(
@@ -56,67 +91,99 @@ class AirportDB:
 
     def __init__(self, airports: Iterable[_AirportRecord]):
         self._by_iata: Dict[str, _AirportRecord] = {}
+        # Airport models are materialized once here and shared by every accessor.
+        self._models_by_iata: Dict[str, Airport] = {}
+        # Records arrive validated and normalized by _load_airports_json.
         for a in airports:
-            code = (a.iata or "").strip().upper()
-            if len(code) != 3:
-                continue
             # keep first occurrence
-            self._by_iata.setdefault(code, a)
+            if a.iata in self._by_iata:
+                continue
+            self._by_iata[a.iata] = a
+            self._models_by_iata[a.iata] = a.to_model()
+
+        # The data is immutable after load, so build the dropdown lists once
+        # instead of re-sorting and re-materializing models on every UI refresh.
+        self._airports_dropdown = self._build_airports_dropdown()
+        self._continents_dropdown = self._build_continents_dropdown()
+        self._countries_dropdown = self._build_countries_dropdown()
+
+        # Inverted indexes so continent/country lookups are a single dict hit.
+        self._by_continent: Dict[str, List[Airport]] = {}
+        self._by_country: Dict[str, List[Airport]] = {}
+        for code, rec in self._by_iata.items():
+            if not rec.commercial_flights:
+                continue
+            model = self._models_by_iata[code]
+            self._by_continent.setdefault(rec.continent, []).append(model)
+            self._by_country.setdefault(rec.country, []).append(model)
+        for airports in self._by_continent.values():
+            airports.sort(key=_COUNTRY_CITY_IATA)
+        for airports in self._by_country.values():
+            airports.sort(key=_CITY_IATA)
 
     @staticmethod
     def _country_code_to_flag(country_code: str) -> str:
         """Convert country code to flag emoji."""
-        if not country_code or len(country_code) != 2:
-            return "🌍"
-        try:
-            code_points = [ord(char) + 127397 for char in country_code.upper()]
-            return chr(code_points[0]) + chr(code_points[1])
-        except:
-            return "🌍"
+        return flag_emoji_for(country_code)
 
     @staticmethod
     def _continent_emoji(continent: str) -> str:
         """Get emoji for continent."""
-        emoji_map = {
-            'Africa': '🌍',
-            'Asia': '🌏',
-            'Europe': '🌍',
-            'North America': '🌎',
-            'South America': '🌎',
-            'Oceania': '🌏',
-            'Antarctica': '🧊',
-        }
-        return emoji_map.get(continent, '🌐')
+        return _CONTINENT_EMOJIS.get(continent, '🌐')
 
     def get_airport(self, iata: str) -> Optional[Airport]:
-        code = (iata or "").strip().upper()
-        rec = self._by_iata.get(code)
-        return rec.to_model() if rec else None
+        return self._models_by_iata.get((iata or "").strip().upper())
+
+    def get_airports(self, iatas: Iterable[str]) -> Dict[str, Airport]:
+        """Batch lookup: return {IATA: Airport} for the known codes in `iatas`.
+
+        Codes are normalized like get_airport; unknown codes are omitted.
+        """
+        models = self._models_by_iata
+        found: Dict[str, Airport] = {}
+        for iata in iatas:
+            code = (iata or "").strip().upper()
+            airport = models.get(code)
+            if airport is not None:
+                found[code] = airport
+        return found
 
     def get_all_airports(self) -> List[Airport]:
-        return [rec.to_model() for rec in self._by_iata.values()]
+        return list(self._models_by_iata.values())
 
     def get_airports_for_dropdown(self) -> List[Tuple[str, str]]:
-        """Return (display_name, iata) pairs for UI dropdowns."""
+        """Return (display_name, iata) pairs for UI dropdowns.
 
-        airports = [rec.to_model() for rec in self._by_iata.values() if rec.commercial_flights]
-        airports.sort(key=lambda a: (a.country, a.city, a.iata))
-        return [(a.display_name, a.iata) for a in airports]
+        The returned list is shared; callers must not mutate it.
+        """
+        return self._airports_dropdown
 
     def get_continents_for_dropdown(self) -> List[Tuple[str, str]]:
         """Return (display_name, continent_code) pairs with emoji.
 
         The current UI treats continent_code as the value key and display_name as the label.
+        The returned list is shared; callers must not mutate it.
         """
-
-        continents = sorted({rec.continent for rec in self._by_iata.values() if rec.continent})
-        return [(f"{self._continent_emoji(c)} {c}", c) for c in continents]
+        return self._continents_dropdown
 
     def get_countries_for_dropdown(self) -> List[Tuple[str, str]]:
         """Return (display_name, country_name) pairs with flag emojis.
 
         The current UI expects a list where item[0] is the label and item[1] is the value.
+        The returned list is shared; callers must not mutate it.
         """
+        return self._countries_dropdown
+
+    def _build_airports_dropdown(self) -> List[Tuple[str, str]]:
+        airports = [self._models_by_iata[code] for code, rec in self._by_iata.items() if rec.commercial_flights]
+        airports.sort(key=_COUNTRY_CITY_IATA)
+        return [(a.display_name, a.iata) for a in airports]
+
+    def _build_continents_dropdown(self) -> List[Tuple[str, str]]:
+        continents = sorted({rec.continent for rec in self._by_iata.values() if rec.continent})
+        return [(f"{self._continent_emoji(c)} {c}", c) for c in continents]
+
+    def _build_countries_dropdown(self) -> List[Tuple[str, str]]:
         # Get unique countries with their country codes
         countries_data = {}
         for rec in self._by_iata.values():
@@ -129,24 +196,27 @@ class AirportDB:
                 for country, code in sorted_countries]
 
     def get_airports_by_continent(self, continent: str) -> List[Airport]:
-        continent = (continent or "").strip()
-        out = [rec.to_model() for rec in self._by_iata.values() if rec.continent == continent and rec.commercial_flights]
-        out.sort(key=lambda a: (a.country, a.city, a.iata))
-        return out
+        """Return commercial airports on a continent (shared list; do not mutate)."""
+        return self._by_continent.get((continent or "").strip(), [])
 
     def get_airports_by_country(self, country: str) -> List[Airport]:
-        country = (country or "").strip()
-        out = [rec.to_model() for rec in self._by_iata.values() if rec.country == country and rec.commercial_flights]
-        out.sort(key=lambda a: (a.city, a.iata))
-        return out
+        """Return commercial airports in a country (shared list; do not mutate)."""
+        return self._by_country.get((country or "").strip(), [])
 
 
 _db_lock = threading.Lock()
 _db_singleton: Optional[AirportDB] = None
 
 
+def _s(value) -> str:
+    """Return `value` as a stripped str; JSON strings skip the str() coercion."""
+    if isinstance(value, str):
+        return value.strip()
+    return str(value).strip() if value else ""
+
+
 def _load_airports_json(path: Path) -> List[_AirportRecord]:
-    raw = json.loads(path.read_text(encoding="utf-8"))
+    raw = json_compat.loads(path.read_bytes())
     if not isinstance(raw, list):
         raise ValueError("airports.json must contain a JSON list")
 
@@ -154,15 +224,21 @@ def _load_airports_json(path: Path) -> List[_AirportRecord]:
     for item in raw:
         if not isinstance(item, dict):
             continue
+        get = item.get
+        iata = _s(get("iata")).upper()
+        # Reject unusable rows before allocating a record for them.
+        if len(iata) != 3 or not iata.isalpha():
+            continue
         airports.append(
             _AirportRecord(
-                iata=str(item.get("iata") or "").strip().upper(),
-                city=str(item.get("city") or "").strip(),
-                country=str(item.get("country") or "").strip(),
-                country_code=str(item.get("country_code") or "").strip().upper(),
-                continent=str(item.get("continent") or "").strip(),
-                airport_name=str(item.get("airport_name") or "").strip(),
-                commercial_flights=bool(item.get("commercial_flights", True)),
+                iata=iata,
+                city=_s(get("city")),
+                # Few distinct values across many rows: share one str object each.
+                country=sys.intern(_s(get("country"))),
+                country_code=sys.intern(_s(get("country_code")).upper()),
+                continent=sys.intern(_s(get("continent"))),
+                airport_name=_s(get("airport_name")),
+                commercial_flights=bool(get("commercial_flights", True)),
             )
         )
     return airports
@@ -172,8 +248,10 @@ def get_airport_db() -> AirportDB:
     """Return a cached AirportDB instance (loads airports.json once)."""
 
     global _db_singleton
-    if _db_singleton is not None:
-        return _db_singleton
+    # Lock-free fast path: a single global load once the DB is built.
+    db = _db_singleton
+    if db is not None:
+        return db
 
     with _db_lock:
         if _db_singleton is not None:
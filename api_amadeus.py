@@ -18,18 +18,33 @@ Notes
 
 from __future__ import annotations
 
+import heapq
+import logging
 import threading
 import time
 from dataclasses import dataclass
-from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
+import json_compat
 from airports import get_airport_db
 from cache import get_cache
 from config import load_config
-from models import FlightDeal
+from fanout import fetch_all
+from models import Airport, FlightDeal, deal_passes_filters, deal_rank
+from rate_limit import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+# The Amadeus test environment only serves departures up to about a year out.
+_TEST_API_HORIZON_DAYS = 365
+
+# Cache payload stored under the duration params when the API rejects that variant.
+_DURATION_REJECTED = "_duration_rejected"
 
 
 def _safe_resp_text(text: str, limit: int = 1000) -> str:
@@ -57,9 +72,15 @@ class AmadeusConfig:
     max_retries: int = 3
     backoff_factor: float = 0.8
     cache_ttl_seconds: int = 6 * 60 * 60
+    # empty results are cached briefly so routes that start returning data show up soon
+    negative_cache_ttl_seconds: int = 5 * 60
     verify_ssl: bool = True
-    # light pacing to reduce 429s
+    # light pacing to reduce 429s: steady rate is 1/min_delay_seconds requests per second
     min_delay_seconds: float = 0.15
+    # token-bucket burst size; the test env rejects >1 request per 100 ms, so keep it small
+    burst: int = 1
+    # concurrent flight-dates lookups per search (I/O bound; pacing still applies)
+    max_workers: int = 4
 
     @staticmethod
     def from_env() -> 'AmadeusConfig':
@@ -83,23 +104,72 @@ class AmadeusClient:
     - APIError on actionable request/auth/rate-limit errors.
     """
 
+    # Fixed attribute set: slot access on the request path instead of a __dict__ lookup.
+    __slots__ = (
+        "config",
+        "cache",
+        "airport_db",
+        "_session",
+        "_probe_session",
+        "_token_lock",
+        "_access_token",
+        "_token_expires_at",
+        "_bucket",
+        "_cfg",
+    )
+
     def __init__(self, config: Optional[AmadeusConfig] = None):
         self.config = config or AmadeusConfig.from_env()
+        # Credentials come from the environment/config.env, loaded once per process.
+        self._cfg = load_config()
         self.cache = get_cache()
         self.airport_db = get_airport_db()
 
-        self._session = requests.Session()
-        self._session.headers.update({
-            "Accept": "application/vnd.amadeus+json",
-            "User-Agent": "FlightDealFinder/2.0",
-        })
+        # One pooled session for token refreshes and API calls so TLS connections are reused.
+        self._session = self._build_session((500, 502, 503, 504))
+        # The optional duration variant of flight-dates: the test API answers HTTP 500 for
+        # some routes when duration is set, so 500 is not retried here (we fall back instead).
+        self._probe_session = self._build_session((502, 503, 504))
 
         self._token_lock = threading.Lock()
         self._access_token: Optional[str] = None
         self._token_expires_at: float = 0.0
 
-        self._rate_lock = threading.Lock()
-        self._last_request_ts: float = 0.0
+        self._bucket = TokenBucket(rate=1.0 / self.config.min_delay_seconds, capacity=self.config.burst)
+
+    def _build_session(self, retry_statuses: Tuple[int, ...]) -> requests.Session:
+        """Pooled session whose adapter retries `retry_statuses` (5xx only) in urllib3."""
+        session = requests.Session()
+        # Every call goes to a single host; size that host's pool to the search workers so
+        # concurrent lookups each keep a warm connection instead of re-handshaking.
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=max(1, self.config.max_workers),
+            pool_block=False,
+            # Transient 5xx are retried inside urllib3 with exponential backoff (same
+            # attempt budget as before). Retry-After is ignored: honouring it would make
+            # urllib3 retry 429s too and sleep for whatever the server asks. 429 and
+            # network errors therefore surface as APIError right away so the UI can
+            # fall back to Travelpayouts quickly.
+            max_retries=Retry(
+                total=max(0, self.config.max_retries - 1),
+                connect=0,
+                read=0,
+                status_forcelist=retry_statuses,
+                allowed_methods=frozenset({"GET", "POST"}),
+                backoff_factor=self.config.backoff_factor,
+                respect_retry_after_header=False,
+                raise_on_status=False,
+            ),
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers.update({
+            "Accept": "application/vnd.amadeus+json",
+            "Accept-Encoding": "gzip, deflate",
+            "User-Agent": "FlightDealFinder/2.0",
+        })
+        return session
 
     # ------------------------------
     # Public API
@@ -118,138 +188,158 @@ class AmadeusClient:
         progress_callback=None,
         cancel_flag: Optional[dict] = None,
     ) -> List[FlightDeal]:
-        print(f"\n[AMADEUS DEBUG] ===== SEARCH DEALS CALLED =====")
-        print(f"[AMADEUS DEBUG] Origin: {origin}")
-        print(f"[AMADEUS DEBUG] Destinations: {len(destinations)} airports")
-        print(f"[AMADEUS DEBUG] Date range: {start_date.date()} to {end_date.date()}")
-        print(f"[AMADEUS DEBUG] Duration: {min_days}-{max_days} days")
-        print(f"[AMADEUS DEBUG] Using API: {self.config.base_url}")
-
-        # Validate date range for test API
-        if "test.api.amadeus.com" in self.config.base_url:
-            days_until_departure = (start_date - datetime.now()).days
-            if days_until_departure > 365:
-                print(f"[AMADEUS DEBUG] WARNING: Test API may not support dates more than 365 days in future")
-                print(f"[AMADEUS DEBUG] WARNING: Current search is {days_until_departure} days ahead")
-                print(f"[AMADEUS DEBUG] WARNING: Consider using dates within next 12 months for test API")
+        logger.debug(
+            "Amadeus search: origin=%s destinations=%d dates=%s..%s duration=%d-%d days api=%s",
+            origin, len(destinations), start_date.date(), end_date.date(), min_days, max_days, self.config.base_url,
+        )
 
         origin = self._normalize_iata(origin)
         if not origin:
-            print(f"[AMADEUS DEBUG] ERROR: Invalid origin IATA")
+            logger.debug("Amadeus search: invalid origin IATA")
             return []
 
         origin_airport = self.airport_db.get_airport(origin)
         if not origin_airport:
-            print(f"[AMADEUS DEBUG] ERROR: Origin airport not found in database")
+            logger.debug("Amadeus search: origin %s not found in airport database", origin)
             return []
 
-        print(f"[AMADEUS DEBUG] Origin airport: {origin_airport.city} ({origin})")
-
         # Keep it efficient: query by destination and month-sized date ranges (not per-day).
         periods = self._generate_periods(start_date, end_date)
-        total = max(1, len(destinations) * len(periods))
-        current = 0
-
-        deals: List[FlightDeal] = []
-
-        for dest in destinations:
-            if cancel_flag and cancel_flag.get('cancelled'):
-                break
 
-            dest = self._normalize_iata(dest)
+        # The test API has no data beyond ~12 months: drop those periods instead of
+        # spending a request per destination on them.
+        if "test.api.amadeus.com" in self.config.base_url:
+            horizon = (date.today() + timedelta(days=_TEST_API_HORIZON_DAYS)).isoformat()
+            in_range = [p for p in periods if p <= horizon]
+            if len(in_range) < len(periods):
+                logger.warning(
+                    "Amadeus test API: skipping %d period(s) more than %d days ahead",
+                    len(periods) - len(in_range), _TEST_API_HORIZON_DAYS,
+                )
+                if not in_range:
+                    raise APIError(
+                        f"Amadeus test environment only has data up to {_TEST_API_HORIZON_DAYS} days ahead."
+                    )
+                periods = in_range
+
+        # Plan the (destination, period) grid up front so it can be fetched concurrently.
+        # Normalize and drop repeats (order-preserving) so each (dest, period) is fetched once.
+        dests = list(dict.fromkeys(self._normalize_iata(d) for d in destinations))
+        dest_airports = self.airport_db.get_airports(dests)
+        tasks: List[Tuple[str, Airport, str]] = []
+        for dest in dests:
             if not dest or dest == origin:
                 continue
 
-            dest_airport = self.airport_db.get_airport(dest)
+            dest_airport = dest_airports.get(dest)
             if not dest_airport:
                 continue
 
             for period in periods:
-                if cancel_flag and cancel_flag.get('cancelled'):
-                    break
-
-                current += 1
-                if progress_callback:
-                    progress_callback(current, total, f"Amadeus {origin}→{dest} ({period})")
-
-                # Use API-supported params:
-                # - departureDate can be a single ISO date OR a comma-separated list/range.
-                #   We pass month-clamped ranges like "YYYY-MM-DD,YYYY-MM-DD".
-                # - currency (not currencyCode)
-                # - duration can be set to min,max
-                data = self._get_cheapest_date_search(
-                    origin=origin,
-                    destination=dest,
-                    period=period,
-                    currency="EUR",
-                    min_days=min_days,
-                    max_days=max_days,
-                )
+                tasks.append((dest, dest_airport, period))
+
+        if not tasks:
+            return []
+
+        responses = self._fetch_all(
+            origin=origin,
+            tasks=tasks,
+            min_days=min_days,
+            max_days=max_days,
+            progress_callback=progress_callback,
+            cancel_flag=cancel_flag,
+        )
 
-                for item in self._extract_flights(data):
-                    deal = self._to_flight_deal(item, origin_airport, dest_airport)
-                    if not deal:
-                        continue
+        deals: List[FlightDeal] = []
+        to_deal = self._to_flight_deal
+        found_at = datetime.utcnow()  # one timestamp per search, not per deal
+        start_day = start_date.date().isoformat()
+        end_day = end_date.date().isoformat()
+
+        for i, (dest, dest_airport, period) in enumerate(tasks):
+            data = responses.get(i)
+            if not data:
+                continue
 
-                    # Strict date and duration filtering
-                    # APIs may return results outside of requested ranges, so we must manually filter
-                    try:
-                        depart_dt = datetime.fromisoformat(deal.depart_date[:10])
-                        return_dt = datetime.fromisoformat(deal.return_date[:10])
-                    except Exception:
-                        # Invalid date format, skip this deal
-                        continue
+            # APIs may return results outside of requested ranges, so we must manually filter
+            deals.extend([
+                deal
+                for item in self._extract_flights(data)
+                if (deal := to_deal(item, origin_airport, dest_airport, found_at)) is not None
+                and deal_passes_filters(deal, start_day, end_day, min_days, max_days)
+            ])
 
-                    # Filter 1: Departure date must be within the specified date range
-                    if not (start_date <= depart_dt <= end_date):
-                        continue
+        return heapq.nsmallest(max_results, self._deduplicate(deals), key=deal_rank)
 
-                    # Filter 2: Trip duration must be within min_days and max_days
-                    trip_days = (return_dt - depart_dt).days
-                    if not (min_days <= trip_days <= max_days):
-                        continue
+    def _fetch_all(
+        self,
+        *,
+        origin: str,
+        tasks: List[Tuple[str, Airport, str]],
+        min_days: int,
+        max_days: int,
+        progress_callback=None,
+        cancel_flag: Optional[dict] = None,
+    ) -> Dict[int, Dict[str, Any]]:
+        """Run the flight-dates lookups for `tasks` via fanout.fetch_all.
 
-                    # Filter 3: Return date should not be unreasonably far in the future
-                    # (though this is implicitly covered by the duration check)
-                    if return_dt < depart_dt:
-                        continue
+        Returns {task index: response payload}; the first APIError is re-raised so
+        the UI can fall back.
+        """
 
-                    deals.append(deal)
+        def fetch(task: Tuple[str, Airport, str]) -> Optional[Dict[str, Any]]:
+            dest, _, period = task
+            # Use API-supported params:
+            # - departureDate can be a single ISO date OR a comma-separated list/range.
+            #   We pass month-clamped ranges like "YYYY-MM-DD,YYYY-MM-DD".
+            # - currency (not currencyCode)
+            # - duration can be set to min,max
+            return self._get_cheapest_date_search(
+                origin=origin,
+                destination=dest,
+                period=period,
+                currency="EUR",
+                min_days=min_days,
+                max_days=max_days,
+            )
 
-        deals = self._deduplicate(deals)
-        deals.sort(key=lambda d: (d.price_eur, d.transfers if d.transfers is not None else 999, d.depart_date))
-        return deals[:max_results]
+        return fetch_all(
+            tasks,
+            fetch,
+            max_workers=self.config.max_workers,
+            describe=lambda task: f"Amadeus {origin}→{task[0]} ({task[2]})",
+            progress_callback=progress_callback,
+            cancel_flag=cancel_flag,
+            thread_name_prefix="amadeus",
+        )
 
     # ------------------------------
     # OAuth + HTTP
     # ------------------------------
 
     def _rate_limit(self) -> None:
-        with self._rate_lock:
-            now = time.time()
-            elapsed = now - self._last_request_ts
-            if elapsed < self.config.min_delay_seconds:
-                time.sleep(self.config.min_delay_seconds - elapsed)
-            self._last_request_ts = time.time()
+        self._bucket.acquire()
 
     def _get_access_token(self) -> str:
-        cfg = load_config()
-        print(f"[AMADEUS DEBUG] Loading config...")
-        print(f"[AMADEUS DEBUG] Has Amadeus credentials: {cfg.has_amadeus}")
-        print(f"[AMADEUS DEBUG] Client ID (masked): {cfg.amadeus_client_id[:8]}...{cfg.amadeus_client_id[-4:] if cfg.amadeus_client_id else 'EMPTY'}")
-
+        # Lock-free fast path for the common case of a still-valid token.
+        # Read the deadline before the token: the refresh below writes the token
+        # first, so a fresh deadline always comes with its matching token.
+        expires_at = self._token_expires_at
+        token = self._access_token
+        if token and time.monotonic() < (expires_at - 30):
+            return token
+
+        cfg = self._cfg
         if not cfg.has_amadeus:
-            print(f"[AMADEUS DEBUG] ERROR: Credentials missing!")
+            logger.warning("Amadeus credentials missing")
             raise APIError("Amadeus credentials missing (AMADEUS_CLIENT_ID/AMADEUS_CLIENT_SECRET)")
 
         with self._token_lock:
-            if self._access_token and time.time() < (self._token_expires_at - 30):
-                print(f"[AMADEUS DEBUG] Using cached token (expires in {int(self._token_expires_at - time.time())}s)")
+            if self._access_token and time.monotonic() < (self._token_expires_at - 30):
                 return self._access_token
 
             url = f"{self.config.base_url}/v1/security/oauth2/token"
-            print(f"[AMADEUS DEBUG] Requesting token from: {url}")
-            print(f"[AMADEUS DEBUG] Using Client ID: {cfg.amadeus_client_id[:8]}...")
+            logger.debug("Requesting Amadeus token from %s (client id %.8s...)", url, cfg.amadeus_client_id)
 
             data = {
                 "grant_type": "client_credentials",
@@ -259,101 +349,93 @@ class AmadeusClient:
 
             self._rate_limit()
             try:
-                print(f"[AMADEUS DEBUG] Sending POST request...")
                 resp = self._session.post(url, data=data, timeout=self.config.timeout, verify=self.config.verify_ssl)
-                print(f"[AMADEUS DEBUG] Response status code: {resp.status_code}")
-                print(f"[AMADEUS DEBUG] Response headers: {dict(resp.headers)}")
-                print(f"[AMADEUS DEBUG] Response body (first 500 chars): {resp.text[:500]}")
             except requests.exceptions.RequestException as e:
-                print(f"[AMADEUS DEBUG] ERROR: Request exception: {type(e).__name__}: {e}")
+                logger.warning("Amadeus token request failed: %s: %s", type(e).__name__, e)
                 raise APIError(f"Amadeus token request failed: {e}")
 
             if resp.status_code != 200:
-                print(f"[AMADEUS DEBUG] ERROR: Non-200 status code!")
+                logger.warning("Amadeus token request returned HTTP %d", resp.status_code)
                 raise APIError(
                     f"Amadeus token request failed (HTTP {resp.status_code}): {_safe_resp_text(resp.text)}",
                     status_code=resp.status_code,
                 )
 
             payload = resp.json() if resp.text else {}
-            print(f"[AMADEUS DEBUG] Token response payload keys: {payload.keys() if payload else 'empty'}")
             token = payload.get("access_token")
             expires_in = int(payload.get("expires_in") or 0)
-            print(f"[AMADEUS DEBUG] Token extracted: {'YES' if token else 'NO'}, expires_in: {expires_in}")
 
             if not token or expires_in <= 0:
-                print(f"[AMADEUS DEBUG] ERROR: Invalid token response!")
+                logger.warning("Amadeus token response missing access_token or expires_in")
                 raise APIError("Amadeus token response missing access_token")
 
             self._access_token = token
-            self._token_expires_at = time.time() + expires_in
-            print(f"[AMADEUS DEBUG] Token successfully cached! Expires at: {time.ctime(self._token_expires_at)}")
+            # Monotonic deadline: immune to wall-clock jumps and cheap to compare.
+            self._token_expires_at = time.monotonic() + expires_in
+            logger.debug("Amadeus token cached for %ds", expires_in)
             return self._access_token
 
-    def _request_json(self, method: str, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        print(f"[AMADEUS DEBUG] Making {method} request to {endpoint}")
-        print(f"[AMADEUS DEBUG] Params: {params}")
+    def _request_json(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        *,
+        retry_server_errors: bool = True,
+    ) -> Dict[str, Any]:
+        """Authorized request; with retry_server_errors=False an HTTP 500 is raised on first sight."""
         token = self._get_access_token()
         url = f"{self.config.base_url}{endpoint}"
         headers = {"Authorization": f"Bearer {token}"}
-        print(f"[AMADEUS DEBUG] Full URL: {url}")
-        print(f"[AMADEUS DEBUG] Using bearer token: {token[:20]}...")
 
-        for attempt in range(self.config.max_retries):
-            print(f"[AMADEUS DEBUG] Attempt {attempt + 1}/{self.config.max_retries}")
-            self._rate_limit()
+        session = self._session if retry_server_errors else self._probe_session
+        self._rate_limit()
+        try:
+            resp = session.request(
+                method,
+                url,
+                params=params,
+                headers=headers,
+                timeout=self.config.timeout,
+                verify=self.config.verify_ssl,
+            )
+        except requests.exceptions.RequestException as e:
+            # network issue → actionable
+            logger.warning("Amadeus request to %s failed: %s: %s", endpoint, type(e).__name__, e)
+            raise APIError(f"Amadeus request failed: {e}")
+
+        status = resp.status_code
+        # One summary record per request; error bodies are reported by the branches below.
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Amadeus %s %s params=%s -> HTTP %d (%d bytes, %.2fs)",
+                method, endpoint, params, status, len(resp.content), resp.elapsed.total_seconds(),
+            )
+
+        if status == 200:
             try:
-                resp = self._session.request(
-                    method,
-                    url,
-                    params=params,
-                    headers=headers,
-                    timeout=self.config.timeout,
-                    verify=self.config.verify_ssl,
-                )
-                print(f"[AMADEUS DEBUG] Response status: {resp.status_code}")
-                print(f"[AMADEUS DEBUG] Response body (first 500 chars): {resp.text[:500]}")
-            except requests.exceptions.RequestException as e:
-                # network issue → actionable
-                print(f"[AMADEUS DEBUG] ERROR: Request exception: {type(e).__name__}: {e}")
-                raise APIError(f"Amadeus request failed: {e}")
-
-            if resp.status_code == 200:
-                try:
-                    result = resp.json()
-                    print(f"[AMADEUS DEBUG] SUCCESS: Got valid JSON response")
-                    return result
-                except Exception:
-                    return {}
-
-            # actionable failures (should trigger fallback)
-            if resp.status_code in (400, 401, 403, 429):
-                error_msg = self._parse_error_message(resp)
-                print(f"[AMADEUS DEBUG] ERROR: Actionable failure - HTTP {resp.status_code}: {error_msg}")
-                raise APIError(
-                    f"Amadeus rejected the request (HTTP {resp.status_code}): {error_msg}",
-                    status_code=resp.status_code,
-                )
+                return json_compat.loads(resp.content)
+            except Exception:
+                return {}
+
+        # actionable failures (should trigger fallback)
+        if status in (400, 401, 403, 429):
+            error_msg = self._parse_error_message(resp)
+            logger.warning("Amadeus rejected %s (HTTP %d): %s", endpoint, status, error_msg)
+            raise APIError(
+                f"Amadeus rejected the request (HTTP {status}): {error_msg}",
+                status_code=status,
+            )
+
+        # 5xx: the adapter has already retried the statuses it retries; this is the final response
+        if status >= 500:
+            error_msg = self._parse_error_message(resp)
+            logger.warning("Amadeus server error on %s (HTTP %d): %s", endpoint, status, error_msg)
+            raise APIError(f"Amadeus server error: {error_msg}", status_code=status)
 
-            # 5xx: retry then eventually raise
-            if resp.status_code >= 500:
-                error_msg = self._parse_error_message(resp)
-                print(f"[AMADEUS DEBUG] WARNING: Server error HTTP {resp.status_code}: {error_msg}")
-                if attempt < self.config.max_retries - 1:
-                    print(f"[AMADEUS DEBUG] Retrying in {self.config.backoff_factor ** attempt:.2f}s...")
-                    time.sleep(self.config.backoff_factor ** attempt)
-                    continue
-                else:
-                    # Last attempt failed - provide detailed error
-                    print(f"[AMADEUS DEBUG] All retries exhausted with error: {error_msg}")
-                    raise APIError(f"Amadeus server error: {error_msg}", status_code=resp.status_code)
-
-            # other codes treat as empty
-            print(f"[AMADEUS DEBUG] WARNING: Unexpected status {resp.status_code}, returning empty dict")
-            return {}
-
-        print(f"[AMADEUS DEBUG] ERROR: All retry attempts exhausted!")
-        raise APIError("Amadeus is temporarily unavailable. Please try again later.")
+        # other codes treat as empty
+        logger.warning("Amadeus returned unexpected HTTP %d for %s; treating as empty", status, endpoint)
+        return {}
 
     # ------------------------------
     # Amadeus endpoints
@@ -384,88 +466,100 @@ class AmadeusClient:
             "currency": currency,
         }
 
-        # Try without duration first for better test API compatibility
-        # Duration parameter can cause 500 errors on test API for some routes
+        if min_days is None or max_days is None:
+            return self._fetch_flight_dates(endpoint, params)
+
+        # One request with the duration filter (fewer, more relevant results). The test API
+        # answers HTTP 500 for some routes when duration is set, and ranges it does not
+        # support are rejected with 400; only then retry without it (we filter locally anyway).
+        params_with_duration = dict(params, duration=f"{min_days},{max_days}")
+        # Entries without duration exist only for routes where the duration variant failed:
+        # reuse them instead of re-sending a request we know gets rejected.
         cached = self.cache.get(endpoint, params)
         if cached is not None:
             return cached
+        # A recent rejection is also remembered under the duration params, so repeats skip
+        # straight to the fallback even when the fallback itself failed last time.
+        rejected = self.cache.get(endpoint, params_with_duration)
+        if rejected is None or _DURATION_REJECTED not in rejected:
+            try:
+                return self._fetch_flight_dates(endpoint, params_with_duration, retry_server_errors=False)
+            except APIError as e:
+                if e.status_code not in (400, 500):
+                    raise
+                self.cache.set(
+                    endpoint,
+                    params_with_duration,
+                    {_DURATION_REJECTED: e.status_code},
+                    ttl_seconds=self.config.negative_cache_ttl_seconds,
+                )
+        return self._fetch_flight_dates(endpoint, params)
 
-        # First attempt: without duration parameter (more compatible)
-        data = self._request_json("GET", endpoint, params=params)
-
-        # If we got data, cache and return it
-        if data and data.get("data"):
-            self.cache.set(endpoint, params, data)
-            return data
-
-        # If no data and we have duration constraints, try with duration parameter
-        if min_days is not None and max_days is not None:
-            params_with_duration = params.copy()
-            params_with_duration["duration"] = f"{min_days},{max_days}"
-
-            cached_with_duration = self.cache.get(endpoint, params_with_duration)
-            if cached_with_duration is not None:
-                return cached_with_duration
+    def _fetch_flight_dates(
+        self, endpoint: str, params: Dict[str, Any], *, retry_server_errors: bool = True
+    ) -> Dict[str, Any]:
+        """Cached GET: hits live for cache_ttl_seconds, empty results only briefly."""
+        cached = self.cache.get(endpoint, params)
+        if cached is not None:
+            return cached
 
-            try:
-                data_with_duration = self._request_json("GET", endpoint, params=params_with_duration)
-                if data_with_duration:
-                    self.cache.set(endpoint, params_with_duration, data_with_duration)
-                    return data_with_duration
-            except APIError:
-                # If duration parameter causes error, fall back to data without it
-                pass
-
-        # Cache the result (even if empty) to avoid repeated failed requests
-        self.cache.set(endpoint, params, data)
+        data = self._request_json("GET", endpoint, params=params, retry_server_errors=retry_server_errors)
+        ttl = self.config.cache_ttl_seconds if data and data.get("data") else self.config.negative_cache_ttl_seconds
+        self.cache.set(endpoint, params, data, ttl_seconds=ttl)
         return data
 
     # ------------------------------
     # Parsing
     # ------------------------------
 
-    def _extract_flights(self, payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def _extract_flights(self, payload: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
         # Response shape: { data: [ { type:'flight-date', origin, destination, departureDate, returnDate, price: { total } , links... } ] }
+        # Yields items straight into the parse loop instead of building a filtered copy.
         data = payload.get("data")
         if isinstance(data, list):
-            return [d for d in data if isinstance(d, dict)]
-        return []
+            for d in data:
+                if isinstance(d, dict):
+                    yield d
+
+    def _to_flight_deal(
+        self, item: Dict[str, Any], origin_airport, dest_airport, found_at: Optional[datetime] = None
+    ) -> Optional[FlightDeal]:
+        # Failure modes are known (missing fields, bad price), so check them explicitly
+        # instead of masking everything behind a blanket except.
+        depart_date = item.get("departureDate") or ""
+        return_date = item.get("returnDate") or ""
+        price_obj = item.get("price")
+        total = price_obj.get("total") if isinstance(price_obj, dict) else None
+        if not depart_date or not return_date or total is None:
+            return None
 
-    def _to_flight_deal(self, item: Dict[str, Any], origin_airport, dest_airport) -> Optional[FlightDeal]:
         try:
-            depart_date = item.get("departureDate") or ""
-            return_date = item.get("returnDate") or ""
-            price_obj = item.get("price") or {}
-            total = price_obj.get("total")
-            if not depart_date or not return_date or total is None:
-                return None
-
             price = float(total)
-            if price <= 0:
-                return None
-
-            # Amadeus flight-dates doesn't provide number of stops; leave transfers None
-            return FlightDeal(
-                origin_iata=origin_airport.iata,
-                dest_iata=dest_airport.iata,
-                origin_city=origin_airport.city,
-                dest_city=dest_airport.city,
-                origin_flag=origin_airport.flag_emoji,
-                dest_flag=dest_airport.flag_emoji,
-                depart_date=depart_date,
-                return_date=return_date,
-                price_eur=price,
-                transfers=None,
-                airline=None,
-                flight_number=None,
-                deep_link=None,
-                found_at=datetime.utcnow(),
-                expires_at=None,
-                raw_payload=item,
-            )
-        except Exception:
+        except (TypeError, ValueError):
+            return None
+        if price <= 0:
             return None
 
+        # Amadeus flight-dates doesn't provide number of stops; leave transfers None
+        return FlightDeal(
+            origin_iata=origin_airport.iata,
+            dest_iata=dest_airport.iata,
+            origin_city=origin_airport.city,
+            dest_city=dest_airport.city,
+            origin_flag=origin_airport.flag_emoji,
+            dest_flag=dest_airport.flag_emoji,
+            depart_date=depart_date,
+            return_date=return_date,
+            price_eur=price,
+            transfers=None,
+            airline=None,
+            flight_number=None,
+            deep_link=None,
+            found_at=found_at or datetime.utcnow(),
+            expires_at=None,
+            raw_payload=item,
+        )
+
     # ------------------------------
     # Helpers
     # ------------------------------
@@ -473,7 +567,7 @@ class AmadeusClient:
     def _parse_error_message(self, resp: requests.Response) -> str:
         """Parse Amadeus error response to extract meaningful error message."""
         try:
-            error_data = resp.json()
+            error_data = json_compat.loads(resp.content) if resp.content else {}
             if isinstance(error_data, dict) and "errors" in error_data:
                 errors = error_data["errors"]
                 if isinstance(errors, list) and len(errors) > 0:
@@ -527,12 +621,11 @@ class AmadeusClient:
         return periods
 
     def _deduplicate(self, deals: List[FlightDeal]) -> List[FlightDeal]:
-        seen = set()
-        out: List[FlightDeal] = []
+        """Keep the cheapest deal per (route, depart day, return day); ties keep the first."""
+        best: Dict[Tuple[str, str, str, str], FlightDeal] = {}
         for d in deals:
             key = (d.origin_iata, d.dest_iata, d.depart_date[:10], d.return_date[:10])
-            if key in seen:
-                continue
-            seen.add(key)
-            out.append(d)
-        return out
+            existing = best.get(key)
+            if existing is None or d.price_eur < existing.price_eur:
+                best[key] = d
+        return list(best.values())
@@ -8,16 +8,21 @@ This provider is used as a fallback when Amadeus returns a request/auth error.
 
 from __future__ import annotations
 
+import heapq
 import time
 from dataclasses import dataclass
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
 
+import json_compat
 from airports import get_airport_db
 from cache import get_cache
-from models import FlightDeal
+from fanout import fetch_all
+from models import Airport, FlightDeal, deal_passes_filters, deal_rank
+from rate_limit import TokenBucket
 
 
 class APIError(RuntimeError):
@@ -37,9 +42,21 @@ class TravelpayoutsConfig:
     max_retries: int = 3
     rate_limit_delay: float = 0.5
     backoff_factor: float = 2.0
+    # token-bucket burst size: up to this many requests go out back-to-back before
+    # pacing falls to the steady 1/rate_limit_delay per second
+    burst: int = 3
+    # extra random stretch (fraction) on limiter waits so queued requests don't align
+    rate_limit_jitter: float = 0.1
+    # concurrent get_latest_prices calls per search (also the connection pool size)
+    max_workers: int = 4
 
 
 class TravelpayoutsClient:
+    _LATEST_PRICES_ENDPOINT = "/aviasales/v3/get_latest_prices"
+
+    # Upper bound (seconds) on a server-provided Retry-After we are willing to sleep.
+    _MAX_RETRY_AFTER = 5
+
     def __init__(self, config: TravelpayoutsConfig):
         if not config.token:
             raise APIError("Travelpayouts token not configured (TRAVELPAYOUTS_TOKEN)", provider="Travelpayouts")
@@ -47,9 +64,18 @@ class TravelpayoutsClient:
         self.config = config
         self.cache = get_cache()
         self.airport_db = get_airport_db()
-        self.last_request_time = 0.0
-
+        self._bucket = TokenBucket(
+            rate=1.0 / config.rate_limit_delay,
+            capacity=config.burst,
+            jitter=config.rate_limit_jitter,
+        )
+
+        # Single host: one pool sized to the search workers so concurrent requests each
+        # keep a warm keep-alive connection. Retries stay in _make_request (429/5xx/timeout).
         self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(1, config.max_workers), max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
         self.session.headers.update({'Accept-Encoding': 'gzip, deflate', 'User-Agent': 'FlightDealFinder/1.0'})
 
     def search_deals(
@@ -65,75 +91,107 @@ class TravelpayoutsClient:
         progress_callback=None,
         cancel_flag: Optional[dict] = None,
     ) -> List[FlightDeal]:
-        deals: List[FlightDeal] = []
-
         origin_airport = self.airport_db.get_airport(origin)
         if not origin_airport:
             return []
 
         periods = self._generate_periods(start_date, end_date)
-        total_queries = len(destinations) * len(periods)
-        current_query = 0
-
-        for destination in destinations:
-            if cancel_flag and cancel_flag.get('cancelled', False):
-                break
-
-            if destination == origin:
-                continue
-
-            dest_airport = self.airport_db.get_airport(destination)
-            if not dest_airport:
-                continue
-
-            for period in periods:
-                if cancel_flag and cancel_flag.get('cancelled', False):
-                    break
-
-                current_query += 1
-                if progress_callback:
-                    progress_callback(current_query, total_queries, f"Travelpayouts {origin}→{destination} ({period})")
-
-                result = self.get_latest_prices(origin=origin, destination=destination, period=period, currency="EUR", one_way=False)
-                if result and 'data' in result:
-                    for item in result['data']:
-                        deal = self._parse_deal(item, origin_airport, dest_airport)
-                        if not deal:
-                            continue
-
-                        # Strict date and duration filtering
-                        # APIs may return results outside of requested ranges, so we must manually filter
-                        try:
-                            depart_dt = datetime.fromisoformat(deal.depart_date[:10])
-                            return_dt = datetime.fromisoformat(deal.return_date[:10])
-                        except Exception:
-                            # Invalid date format, skip this deal
-                            continue
-
-                        # Filter 1: Departure date must be within the specified date range
-                        if not (start_date <= depart_dt <= end_date):
-                            continue
-
-                        # Filter 2: Trip duration must be within min_days and max_days
-                        trip_days = (return_dt - depart_dt).days
-                        if not (min_days <= trip_days <= max_days):
-                            continue
-
-                        # Filter 3: Return date should not be before departure date
-                        if return_dt < depart_dt:
-                            continue
-
-                        deals.append(deal)
-
-        deals = self._deduplicate_deals(deals)
-        deals = sorted(deals, key=lambda d: (d.price_eur, d.transfers if d.transfers is not None else 999, d.depart_date))
-        return deals[:max_results]
+        # Drop repeated destinations (order-preserving) so each (dest, period) is fetched once.
+        destinations = list(dict.fromkeys(destinations))
+
+        # Resolve each destination once (skipping the origin and unknown codes), then
+        # plan the flat (destination, airport, period) job list.
+        get_airport = self.airport_db.get_airport
+        dest_airports = {
+            d: airport for d in destinations if d != origin and (airport := get_airport(d)) is not None
+        }
+        tasks: List[Tuple[str, Airport, str]] = [
+            (destination, dest_airport, period)
+            for destination, dest_airport in dest_airports.items()
+            for period in periods
+        ]
+        if not tasks:
+            return []
+
+        # Warm re-runs: one batched cache read, then only the misses go to the network.
+        endpoint = self._LATEST_PRICES_ENDPOINT
+        latest_prices_params = self._latest_prices_params
+        responses: Dict[int, dict] = self.cache.get_many(
+            [(endpoint, latest_prices_params(origin, dest, period, "EUR", False)) for dest, _, period in tasks]
+        )
+        misses = [i for i in range(len(tasks)) if i not in responses]
+        # Progress covers the whole plan: cached hits count as done up front, and worker
+        # progress is offset by them.
+        total, hits = len(tasks), len(responses)
+        worker_progress = None
+        if progress_callback:
+            if hits:
+                progress_callback(hits, total, f"Travelpayouts {origin}: {hits} cached")
+
+            def worker_progress(done: int, _total: int, message: str) -> None:
+                progress_callback(hits + done, total, message)
+
+        if misses:
+            fetched = self._fetch_all(
+                origin=origin,
+                tasks=[tasks[i] for i in misses],
+                progress_callback=worker_progress,
+                cancel_flag=cancel_flag,
+            )
+            for j, data in fetched.items():
+                responses[misses[j]] = data
+
+        deals: List[FlightDeal] = []
+        parse_deal = self._parse_deal
+        start_day = start_date.date().isoformat()
+        end_day = end_date.date().isoformat()
+
+        for i, (destination, dest_airport, period) in enumerate(tasks):
+            result = responses.get(i)
+            if result and 'data' in result:
+                found_at = datetime.utcnow()  # one timestamp per response, not per deal
+                # APIs may return results outside of requested ranges, so we must manually filter
+                deals.extend([
+                    deal
+                    for item in result['data']
+                    if (deal := parse_deal(item, origin_airport, dest_airport, found_at)) is not None
+                    and deal_passes_filters(deal, start_day, end_day, min_days, max_days)
+                ])
+
+        return heapq.nsmallest(max_results, self._deduplicate_deals(deals), key=deal_rank)
+
+    def _fetch_all(
+        self,
+        *,
+        origin: str,
+        tasks: List[Tuple[str, Airport, str]],
+        progress_callback=None,
+        cancel_flag: Optional[dict] = None,
+    ) -> Dict[int, dict]:
+        """Run get_latest_prices for `tasks` via fanout.fetch_all.
+
+        Returns {task index: response payload}; the first APIError is re-raised.
+        """
+
+        def fetch(task: Tuple[str, Airport, str]) -> Optional[dict]:
+            destination, _, period = task
+            return self.get_latest_prices(origin=origin, destination=destination, period=period, currency="EUR", one_way=False)
+
+        return fetch_all(
+            tasks,
+            fetch,
+            max_workers=self.config.max_workers,
+            describe=lambda task: f"Travelpayouts {origin}→{task[0]} ({task[2]})",
+            progress_callback=progress_callback,
+            cancel_flag=cancel_flag,
+            thread_name_prefix="travelpayouts",
+        )
 
     # ---- API calls ----
 
-    def get_latest_prices(self, *, origin: str, destination: str, period: str, currency: str, one_way: bool, limit: int = 1000) -> Optional[dict]:
-        endpoint = "/aviasales/v3/get_latest_prices"
-        params = {
+    @staticmethod
+    def _latest_prices_params(origin: str, destination: str, period: str, currency: str, one_way: bool, limit: int = 1000) -> dict:
+        return {
             'origin': origin,
             'destination': destination,
             'beginning_of_period': period,
@@ -143,6 +201,10 @@ class TravelpayoutsClient:
             'limit': limit,
         }
 
+    def get_latest_prices(self, *, origin: str, destination: str, period: str, currency: str, one_way: bool, limit: int = 1000) -> Optional[dict]:
+        endpoint = self._LATEST_PRICES_ENDPOINT
+        params = self._latest_prices_params(origin, destination, period, currency, one_way, limit)
+
         cached = self.cache.get(endpoint, params)
         if cached is not None:
             return cached
@@ -164,29 +226,35 @@ class TravelpayoutsClient:
             try:
                 self._rate_limit()
                 response = self.session.get(url, params=params, timeout=self.config.timeout)
-                last_status = response.status_code
-                last_text = (response.text or "")[:300]
+                status = response.status_code
 
-                if response.status_code == 200:
-                    return response.json()
+                if status == 200:
+                    return json_compat.loads(response.content)
 
-                if response.status_code == 401 or response.status_code == 403:
-                    raise APIError(
-                        "Travelpayouts authorization failed (check TRAVELPAYOUTS_TOKEN).",
-                        status_code=response.status_code,
-                        provider="Travelpayouts",
-                    )
+                last_status = status
+                last_text = (response.text or "")[:300]
 
-                if response.status_code == 429:
-                    wait_time = self.config.backoff_factor ** attempt
-                    time.sleep(wait_time)
+                if status >= 500:
+                    time.sleep(self.config.backoff_factor ** attempt)
                     continue
 
-                if response.status_code >= 500:
-                    wait_time = self.config.backoff_factor ** attempt
+                if status == 429:
+                    retry_after = response.headers.get('Retry-After')
+                    # ASCII digits only: isdigit() also accepts e.g. '²', which int() rejects
+                    if retry_after and retry_after.isascii() and retry_after.isdecimal():
+                        wait_time = min(int(retry_after), self._MAX_RETRY_AFTER)
+                    else:
+                        wait_time = self.config.backoff_factor ** attempt
                     time.sleep(wait_time)
                     continue
 
+                if status == 401 or status == 403:
+                    raise APIError(
+                        "Travelpayouts authorization failed (check TRAVELPAYOUTS_TOKEN).",
+                        status_code=status,
+                        provider="Travelpayouts",
+                    )
+
                 # 4xx other than auth: treat as non-fatal (no results)
                 return None
 
@@ -195,6 +263,9 @@ class TravelpayoutsClient:
                     time.sleep(self.config.backoff_factor ** attempt)
             except requests.exceptions.RequestException as e:
                 raise APIError(f"Travelpayouts request failed: {e}", provider="Travelpayouts")
+            except ValueError as e:
+                # malformed JSON body (response.json() used to surface this as a RequestException)
+                raise APIError(f"Travelpayouts returned invalid JSON: {e}", provider="Travelpayouts")
 
         # Retries exhausted on 429/5xx/timeouts
         if last_status in (429,) or (last_status is not None and last_status >= 500):
@@ -207,65 +278,66 @@ class TravelpayoutsClient:
         return None
 
     def _rate_limit(self) -> None:
-        elapsed = time.time() - self.last_request_time
-        if elapsed < self.config.rate_limit_delay:
-            time.sleep(self.config.rate_limit_delay - elapsed)
-        self.last_request_time = time.time()
+        self._bucket.acquire()
 
     # ---- parsing helpers ----
 
     def _generate_periods(self, start_date: datetime, end_date: datetime) -> List[str]:
+        # Walk (year, month) as ints: no datetime allocation or strftime per month.
         periods: List[str] = []
-        current = start_date.replace(day=1)
-        end = end_date.replace(day=1)
-        while current <= end:
-            periods.append(current.strftime('%Y-%m'))
-            if current.month == 12:
-                current = current.replace(year=current.year + 1, month=1)
-            else:
-                current = current.replace(month=current.month + 1)
+        year, month = start_date.year, start_date.month
+        end = (end_date.year, end_date.month)
+        while (year, month) <= end:
+            periods.append(f"{year:04d}-{month:02d}")
+            month += 1
+            if month == 13:
+                year, month = year + 1, 1
         return periods
 
-    def _parse_deal(self, data: dict, origin_airport, dest_airport) -> Optional[FlightDeal]:
+    def _parse_deal(
+        self, data: dict, origin_airport, dest_airport, found_at: Optional[datetime] = None
+    ) -> Optional[FlightDeal]:
+        # Failure modes are known (non-dict rows, missing fields, bad price), so check
+        # them explicitly instead of masking everything behind a blanket except.
+        if not isinstance(data, dict):
+            return None
         try:
             price = float(data.get('value', data.get('price', 0)))
-            depart_date = data.get('departure_at', data.get('depart_date', ''))
-            return_date = data.get('return_at', data.get('return_date', ''))
-
-            if not depart_date or not return_date or price <= 0:
-                return None
-
-            deal = FlightDeal(
-                origin_iata=origin_airport.iata,
-                dest_iata=dest_airport.iata,
-                origin_city=origin_airport.city,
-                dest_city=dest_airport.city,
-                origin_flag=origin_airport.flag_emoji,
-                dest_flag=dest_airport.flag_emoji,
-                depart_date=depart_date,
-                return_date=return_date,
-                price_eur=price,
-                transfers=data.get('transfers', data.get('number_of_changes')),
-                airline=data.get('airline'),
-                flight_number=data.get('flight_number'),
-                deep_link=data.get('link'),
-                found_at=datetime.utcnow(),
-                expires_at=None,
-                raw_payload=data,
-            )
-            return deal
+        except (TypeError, ValueError):
+            return None
+        depart_date = data.get('departure_at', data.get('depart_date', ''))
+        return_date = data.get('return_at', data.get('return_date', ''))
 
-        except Exception:
+        if not depart_date or not return_date or price <= 0:
             return None
 
+        return FlightDeal(
+            origin_iata=origin_airport.iata,
+            dest_iata=dest_airport.iata,
+            origin_city=origin_airport.city,
+            dest_city=dest_airport.city,
+            origin_flag=origin_airport.flag_emoji,
+            dest_flag=dest_airport.flag_emoji,
+            depart_date=depart_date,
+            return_date=return_date,
+            price_eur=price,
+            transfers=data.get('transfers', data.get('number_of_changes')),
+            airline=data.get('airline'),
+            flight_number=data.get('flight_number'),
+            deep_link=data.get('link'),
+            found_at=found_at or datetime.utcnow(),
+            expires_at=None,
+            raw_payload=data,
+        )
+
     def _deduplicate_deals(self, deals: List[FlightDeal]) -> List[FlightDeal]:
-        seen = set()
-        unique: List[FlightDeal] = []
+        # Keep the cheapest deal per (route, depart day, return day); ties keep the first.
+        # Dates are sliced only for the key: the stored timestamps keep their time part.
+        best: Dict[Tuple[str, str, str, str], FlightDeal] = {}
         for d in deals:
             key = (d.origin_iata, d.dest_iata, d.depart_date[:10], d.return_date[:10])
-            if key in seen:
-                continue
-            seen.add(key)
-            unique.append(d)
-        return unique
+            existing = best.get(key)
+            if existing is None or d.price_eur < existing.price_eur:
+                best[key] = d
+        return list(best.values())
 
@@ -3,30 +3,66 @@ Caching module for API responses.
 Uses SQLite for lightweight disk-based caching.
 '''
 
+import os
 import sqlite3
-import json
+import sys
 import hashlib
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Optional, Any
+from typing import Optional, Any, Dict, List, Tuple
 import threading
 
+import json_compat
+from config import APP_NAME_NO_SPACES, exe_dir, is_frozen, project_root_dir
+
+
+def _default_db_path() -> Path:
+    '''Stable cache DB location, so entries survive restarts whatever the working directory.
+
+    Dev runs keep it next to the sources. Frozen builds use a per-user folder and
+    never the bundle itself (a macOS .app is often read-only and replaced on update):
+    %LOCALAPPDATA%/FlightDealFinder on Windows (next to the exe if that is unset),
+    ~/Library/Caches/FlightDealFinder on macOS, $XDG_CACHE_HOME (or ~/.cache) elsewhere.
+    '''
+    if not is_frozen():
+        return project_root_dir() / "flight_cache.db"
+    if sys.platform == "win32":
+        local_appdata = os.getenv('LOCALAPPDATA')
+        base = Path(local_appdata) / APP_NAME_NO_SPACES if local_appdata else exe_dir()
+    elif sys.platform == "darwin":
+        base = Path.home() / "Library" / "Caches" / APP_NAME_NO_SPACES
+    else:
+        base = Path(os.getenv('XDG_CACHE_HOME') or Path.home() / ".cache") / APP_NAME_NO_SPACES
+    return base / "flight_cache.db"
+
 
 class APICache:
     '''Disk-based cache using SQLite.'''
 
-    def __init__(self, db_path: str = "flight_cache.db", ttl_hours: int = 6):
+    def __init__(self, db_path: str = "flight_cache.db", ttl_hours: int = 6, memory_entries: int = 256):
         '''
         Initialize the cache.
 
         Args:
             db_path: Path to SQLite database file
             ttl_hours: Time-to-live in hours (default: 6 hours)
+            memory_entries: Size of the in-process LRU kept in front of SQLite
+                (0 disables it)
         '''
         self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
         self.ttl_hours = ttl_hours
         self._lock = threading.Lock()
+        # key -> (monotonic expiry, decoded value); bounded LRU so repeat lookups
+        # within a session skip the SQLite round-trip and JSON decode.
+        self._memory: 'OrderedDict[str, Tuple[float, Any]]' = OrderedDict()
+        self._memory_entries = max(0, memory_entries)
         self._init_db()
+        # Rows are otherwise only dropped when the same key is read again, so rows
+        # orphaned by a cache-key format change would sit in the file forever.
+        self.clear_expired()
 
     def _init_db(self):
         '''Initialize the database schema.'''
@@ -46,15 +82,33 @@ class APICache:
             conn.commit()
 
     def _make_key(self, endpoint: str, params: dict) -> str:
-        '''Generate a cache key from endpoint and parameters.'''
-        sorted_params = json.dumps(params, sort_keys=True)
-        key_string = f"{endpoint}:{sorted_params}"
-        return hashlib.sha256(key_string.encode()).hexdigest()
+        '''Generate a cache key from endpoint and parameters.
+
+        Keys only identify local cache rows (they are not security digests), so a
+        128-bit BLAKE2b is plenty. Provider params are small flat dicts of scalars,
+        so a sorted join is a stable encoding without running a JSON encoder. Values
+        are repr()'d (quoted, control characters escaped) and fields are separated
+        by the ASCII unit separator (0x1F), so a value can never imitate another field.
+        '''
+        key_string = endpoint + "\x1f" + "\x1f".join(f"{k}={params[k]!r}" for k in sorted(params))
+        return hashlib.blake2b(key_string.encode(), digest_size=16).hexdigest()
+
+    def _remember(self, key: str, value: Any, ttl_seconds: float):
+        '''Put a decoded value in the in-memory LRU (caller holds the lock).'''
+        if self._memory_entries <= 0 or ttl_seconds <= 0:
+            return
+        self._memory[key] = (time.monotonic() + ttl_seconds, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self._memory_entries:
+            self._memory.popitem(last=False)
 
     def get(self, endpoint: str, params: dict) -> Optional[Any]:
         '''
         Get cached value if it exists and is not expired.
 
+        Values served from the in-memory layer are shared between callers;
+        treat them as read-only.
+
         Args:
             endpoint: API endpoint
             params: API parameters
@@ -64,6 +118,14 @@ class APICache:
         '''
         key = self._make_key(endpoint, params)
 
+        with self._lock:
+            hit = self._memory.get(key)
+            if hit is not None:
+                if time.monotonic() < hit[0]:
+                    self._memory.move_to_end(key)
+                    return hit[1]
+                del self._memory[key]
+
         with self._lock, sqlite3.connect(self.db_path) as conn:
             cursor = conn.execute(
                 'SELECT value, expires_at FROM cache WHERE key = ?',
@@ -77,12 +139,74 @@ class APICache:
             value_json, expires_at_str = row
             expires_at = datetime.fromisoformat(expires_at_str)
 
-            if datetime.now(timezone.utc) > expires_at:
+            now = datetime.now(timezone.utc)
+            if now > expires_at:
                 conn.execute('DELETE FROM cache WHERE key = ?', (key,))
                 conn.commit()
                 return None
 
-            return json.loads(value_json)
+            value = json_compat.loads(value_json)
+            self._remember(key, value, (expires_at - now).total_seconds())
+            return value
+
+    def get_many(self, items: List[Tuple[str, dict]]) -> Dict[int, Any]:
+        '''
+        Batch form of get(): look up several (endpoint, params) pairs at once.
+
+        Memory hits are served first; the remaining keys are fetched from SQLite
+        with one connection and a single IN (...) query per chunk.
+
+        Args:
+            items: (endpoint, params) pairs
+
+        Returns:
+            {index into items: cached value} for the entries that are present and fresh
+        '''
+        found: Dict[int, Any] = {}
+        pending: Dict[str, List[int]] = {}
+        keys = [self._make_key(endpoint, params) for endpoint, params in items]
+
+        with self._lock:
+            now_mono = time.monotonic()
+            for i, key in enumerate(keys):
+                hit = self._memory.get(key)
+                if hit is not None:
+                    if now_mono < hit[0]:
+                        self._memory.move_to_end(key)
+                        found[i] = hit[1]
+                        continue
+                    del self._memory[key]
+                pending.setdefault(key, []).append(i)
+
+        if not pending:
+            return found
+
+        missing = list(pending)
+        with self._lock, sqlite3.connect(self.db_path) as conn:
+            now = datetime.now(timezone.utc)
+            expired: List[str] = []
+            # Stay well under SQLite's bound-parameter limit (999 on older builds).
+            for start in range(0, len(missing), 500):
+                chunk = missing[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                # Only "?" placeholders are interpolated; the keys are bound parameters.
+                query = f'SELECT key, value, expires_at FROM cache WHERE key IN ({placeholders})'  # nosec B608
+                cursor = conn.execute(query, chunk)
+                for key, value_json, expires_at_str in cursor:
+                    expires_at = datetime.fromisoformat(expires_at_str)
+                    if now > expires_at:
+                        expired.append(key)
+                        continue
+                    value = json_compat.loads(value_json)
+                    self._remember(key, value, (expires_at - now).total_seconds())
+                    for i in pending[key]:
+                        found[i] = value
+
+            if expired:
+                conn.executemany('DELETE FROM cache WHERE key = ?', [(k,) for k in expired])
+                conn.commit()
+
+        return found
 
     def set(self, endpoint: str, params: dict, value: Any, ttl_seconds: Optional[int] = None):
         '''
@@ -96,7 +220,7 @@ class APICache:
                 falls back to the instance ttl_hours.
         '''
         key = self._make_key(endpoint, params)
-        value_json = json.dumps(value)
+        value_json = json_compat.dumps(value).decode("utf-8")
         created_at = datetime.now(timezone.utc)
 
         ttl_s: Optional[int]
@@ -121,6 +245,7 @@ class APICache:
                 created_at.isoformat()
             ))
             conn.commit()
+            self._remember(key, value, (expires_at - created_at).total_seconds())
 
     def clear_expired(self):
         '''Remove all expired entries from the cache.'''
@@ -141,6 +266,7 @@ class APICache:
         with self._lock, sqlite3.connect(self.db_path) as conn:
             conn.execute('DELETE FROM cache')
             conn.commit()
+            self._memory.clear()
 
     def get_stats(self) -> dict:
         '''Get cache statistics.'''
@@ -168,5 +294,5 @@ def get_cache() -> APICache:
     '''Get or create the global cache instance.'''
     global _cache_instance
     if _cache_instance is None:
-        _cache_instance = APICache()
+        _cache_instance = APICache(db_path=str(_default_db_path()))
     return _cache_instance
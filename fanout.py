@@ -0,0 +1,69 @@
+"""Bounded thread-pool fan-out shared by the API providers."""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, Optional, Sequence, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def fetch_all(
+    tasks: Sequence[T],
+    fetch: Callable[[T], Optional[R]],
+    *,
+    max_workers: int,
+    describe: Callable[[T], str],
+    progress_callback=None,
+    cancel_flag: Optional[dict] = None,
+    thread_name_prefix: str = "",
+) -> Dict[int, R]:
+    """Run `fetch(task)` for every task on a bounded thread pool.
+
+    Returns {task index: result} for the truthy results; callers walk it in plan
+    order, so output does not depend on completion order. Requests are I/O bound,
+    so a few workers overlap network latency while the providers' TokenBucket
+    paces the actual calls. The first exception cancels the remaining work and is
+    re-raised. Progress is reported from the calling thread only, as
+    (done, len(tasks), describe(task)).
+    """
+
+    # The UI flips cancel_flag['cancelled'] from its own thread; workers and the
+    # result loop both check it.
+    flag_get = (cancel_flag if cancel_flag is not None else {}).get
+
+    def is_cancelled() -> bool:
+        return bool(flag_get('cancelled'))
+
+    def run(task: T) -> Optional[R]:
+        if is_cancelled():
+            return None
+        return fetch(task)
+
+    results: Dict[int, R] = {}
+    if not tasks:
+        return results
+
+    total = len(tasks)
+    done = 0
+    pool = ThreadPoolExecutor(max_workers=max(1, min(max_workers, total)), thread_name_prefix=thread_name_prefix)
+    try:
+        futures = {pool.submit(run, task): i for i, task in enumerate(tasks)}
+        for future in as_completed(futures):
+            i = futures[future]
+            result = future.result()
+            if result:
+                results[i] = result
+
+            done += 1
+            if progress_callback:
+                progress_callback(done, total, describe(tasks[i]))
+
+            if is_cancelled():
+                break
+    finally:
+        # Drop queued work on cancel/error; in-flight requests finish in the background.
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    return results
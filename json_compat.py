@@ -0,0 +1,34 @@
+"""JSON helpers that prefer orjson when it is available.
+
+orjson parses bytes directly and is several times faster than the stdlib on
+the payloads this app handles (airports.json, provider responses). It is an
+optional dependency: without it we fall back to the stdlib `json` module.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def loads(data: Union[bytes, bytearray, str]) -> Any:
+    """Parse a JSON document from bytes or str.
+
+    Pass `response.content` rather than calling `response.json()`: the raw bytes
+    go straight to the parser with no text decode or charset detection pass.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any) -> bytes:
+    """Serialize `obj` to compact UTF-8 JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
@@ -3,12 +3,32 @@ Data models for the flight deal finder application.
 """
 
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import date, datetime
+from functools import lru_cache
 from typing import Optional
 
-@dataclass
+
+@lru_cache(maxsize=None)
+def flag_emoji_for(country_code: str) -> str:
+    """Convert an ISO-3166 alpha-2 country code to its flag emoji (cached per code)."""
+    code = (country_code or "").upper()
+    if len(code) != 2 or not (code.isascii() and code.isalpha()):
+        return "🌍"
+    return chr(ord(code[0]) + 127397) + chr(ord(code[1]) + 127397)
+
+
+@lru_cache(maxsize=4096)
+def day_ordinal(value: str) -> int:
+    """YYYY-MM-DD -> proleptic ordinal day; memoized because the same days recur across a search."""
+    return date.fromisoformat(value).toordinal()
+
+
+@dataclass(slots=True)
 class FlightDeal:
-    """Represents a flight deal with all relevant information."""
+    """Represents a flight deal with all relevant information.
+
+    Slotted: a search builds hundreds of these, so skip the per-instance __dict__.
+    """
     origin_iata: str
     dest_iata: str
     origin_city: str
@@ -49,6 +69,34 @@ class FlightDeal:
         )
 
 
+def deal_rank(d: FlightDeal):
+    """Result ordering: price, then fewer transfers (unknown last), then departure."""
+    return (d.price_eur, d.transfers if d.transfers is not None else 999, d.depart_date)
+
+
+def deal_passes_filters(deal: FlightDeal, start_day: str, end_day: str, min_days: int, max_days: int) -> bool:
+    """Strict date and duration filtering (`start_day`/`end_day` are YYYY-MM-DD).
+
+    ISO YYYY-MM-DD strings order like the dates they encode, so the range check is a
+    plain string comparison; only deals inside it get parsed for the trip length.
+    """
+    try:
+        depart_day = deal.depart_date[:10]
+
+        # Filter 1: Departure date must be within the specified date range
+        if not (start_day <= depart_day <= end_day):
+            return False
+
+        trip_days = day_ordinal(deal.return_date[:10]) - day_ordinal(depart_day)
+    except (TypeError, ValueError):
+        # Invalid date format, skip this deal
+        return False
+
+    # Filter 2: Trip duration must be within min_days and max_days
+    # Filter 3: Return date should not be before departure
+    return min_days <= trip_days <= max_days and trip_days >= 0
+
+
 @dataclass
 class Airport:
     """Represents an airport with location information."""
@@ -62,13 +110,7 @@ class Airport:
     @property
     def flag_emoji(self) -> str:
         """Convert country code to flag emoji."""
-        if not self.country_code or len(self.country_code) != 2:
-            return "🌍"
-        try:
-            code_points = [ord(char) + 127397 for char in self.country_code.upper()]
-            return chr(code_points[0]) + chr(code_points[1])
-        except:
-            return "🌍"
+        return flag_emoji_for(self.country_code)
 
     @property
     def display_name(self) -> str:
@@ -0,0 +1,49 @@
+"""Thread-safe token-bucket rate limiter shared by the API providers."""
+
+from __future__ import annotations
+
+import random
+import threading
+import time
+
+
+class TokenBucket:
+    """Allow bursts of up to `capacity` calls, refilled at `rate` tokens per second.
+
+    `acquire()` reserves a token under the lock and sleeps outside it, so
+    concurrent callers queue up behind each other instead of serializing on a
+    mutex held across `time.sleep`. A non-zero `jitter` stretches each wait by
+    up to that fraction so queued callers don't wake in lockstep; it never
+    shortens a wait, so the configured rate still holds.
+    """
+
+    def __init__(self, *, rate: float, capacity: float = 1.0, jitter: float = 0.0):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.capacity = max(1.0, float(capacity))
+        self.jitter = max(0.0, float(jitter))
+        self._tokens = self.capacity
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def consume(self, n: float = 1.0) -> float:
+        """Reserve `n` tokens and return how long (seconds) the caller must wait."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._last_refill) * self.rate)
+            self._last_refill = now
+            # Going negative records the reservation, so later callers wait longer.
+            self._tokens -= n
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self, n: float = 1.0) -> None:
+        """Block until `n` tokens are available."""
+        wait = self.consume(n)
+        if wait > 0:
+            if self.jitter:
+                # Scheduling jitter, not a security value.
+                wait *= 1.0 + random.random() * self.jitter  # nosec B311
+            time.sleep(wait)
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# The app is a flat set of modules in the project root (no package); make them importable.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
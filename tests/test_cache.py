@@ -0,0 +1,80 @@
+import sqlite3
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from cache import APICache
+
+ENDPOINT = "/v1/test"
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return tmp_path / "cache.db"
+
+
+def _row_count(db_path, key=None):
+    with sqlite3.connect(db_path) as conn:
+        if key is None:
+            return conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+        return conn.execute("SELECT COUNT(*) FROM cache WHERE key = ?", (key,)).fetchone()[0]
+
+
+def _delete_rows(db_path):
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("DELETE FROM cache")
+        conn.commit()
+
+
+def test_get_many_serves_memory_hits_without_sqlite(db_path):
+    cache = APICache(db_path=str(db_path))
+    cache.set(ENDPOINT, {"q": 1}, {"data": [1]})
+    _delete_rows(db_path)  # only the in-memory layer still has the entry
+
+    assert cache.get_many([(ENDPOINT, {"q": 1})]) == {0: {"data": [1]}}
+
+
+def test_get_many_remembers_sqlite_hits(db_path):
+    APICache(db_path=str(db_path)).set(ENDPOINT, {"q": 1}, {"data": [1]})
+    cache = APICache(db_path=str(db_path))  # fresh instance: empty memory layer
+
+    assert cache.get_many([(ENDPOINT, {"q": 1})]) == {0: {"data": [1]}}
+
+    _delete_rows(db_path)
+    assert cache.get_many([(ENDPOINT, {"q": 1})]) == {0: {"data": [1]}}
+
+
+def test_get_many_deletes_expired_rows(db_path):
+    cache = APICache(db_path=str(db_path))
+    key = cache._make_key(ENDPOINT, {"q": 1})
+    past = datetime.now(timezone.utc) - timedelta(minutes=1)
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(
+            "INSERT INTO cache (key, value, expires_at, created_at) VALUES (?, ?, ?, ?)",
+            (key, '{"data":[1]}', past.isoformat(), (past - timedelta(hours=1)).isoformat()),
+        )
+        conn.commit()
+
+    assert cache.get_many([(ENDPOINT, {"q": 1})]) == {}
+    assert _row_count(db_path, key) == 0
+
+
+@pytest.mark.parametrize("memory_entries", [0, 256])
+def test_get_many_maps_duplicate_params_to_every_index(db_path, memory_entries):
+    cache = APICache(db_path=str(db_path), memory_entries=memory_entries)
+    cache.set(ENDPOINT, {"q": 1}, "one")
+    cache.set(ENDPOINT, {"q": 2}, "two")
+
+    items = [(ENDPOINT, {"q": 1}), (ENDPOINT, {"q": 2}), (ENDPOINT, {"q": 3}), (ENDPOINT, {"q": 1})]
+    assert cache.get_many(items) == {0: "one", 1: "two", 3: "one"}
+
+
+def test_get_many_spans_query_chunks(db_path):
+    cache = APICache(db_path=str(db_path), memory_entries=0)  # force every lookup through SQLite
+    for n in range(0, 1200, 2):
+        cache.set(ENDPOINT, {"q": n}, n)
+
+    found = cache.get_many([(ENDPOINT, {"q": n}) for n in range(1200)])
+
+    assert found == {n: n for n in range(0, 1200, 2)}
+    assert _row_count(db_path) == 600
@@ -0,0 +1,89 @@
+import pytest
+
+import rate_limit
+from rate_limit import TokenBucket
+
+
+class FakeClock:
+    """Stands in for the `time` module: sleep() advances monotonic() instantly."""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+        self.on_sleep = None
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        if self.on_sleep:
+            self.on_sleep()
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(rate_limit, "time", fake)
+    return fake
+
+
+def test_rejects_non_positive_rate():
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
+
+
+def test_burst_up_to_capacity_then_reservations_queue(clock):
+    bucket = TokenBucket(rate=2.0, capacity=3)
+
+    assert [bucket.consume() for _ in range(3)] == [0.0, 0.0, 0.0]
+    # Tokens go negative to record reservations: each later caller waits one interval longer.
+    assert bucket.consume() == pytest.approx(0.5)
+    assert bucket.consume() == pytest.approx(1.0)
+
+
+def test_refill_is_capped_at_capacity(clock):
+    bucket = TokenBucket(rate=1.0, capacity=2)
+    bucket.consume()
+    bucket.consume()
+
+    clock.now += 100.0  # long idle period
+    assert [bucket.consume() for _ in range(2)] == [0.0, 0.0]
+    assert bucket.consume() == pytest.approx(1.0)
+
+
+def test_acquire_paces_at_rate_after_burst(clock):
+    bucket = TokenBucket(rate=4.0, capacity=2)
+    start = clock.now
+
+    for _ in range(10):
+        bucket.acquire()
+
+    assert clock.sleeps == pytest.approx([0.25] * 8)
+    assert clock.now - start == pytest.approx(2.0)
+
+
+def test_acquire_sleeps_outside_the_lock(clock):
+    bucket = TokenBucket(rate=1.0, capacity=1)
+    bucket.acquire()
+
+    def check_unlocked():
+        assert not bucket._lock.locked()
+
+    clock.on_sleep = check_unlocked
+    bucket.acquire()
+    assert clock.sleeps == pytest.approx([1.0])
+
+
+def test_jitter_only_stretches_waits(clock, monkeypatch):
+    bucket = TokenBucket(rate=1.0, capacity=1, jitter=0.1)
+    bucket.acquire()  # burst token: no wait, no jitter
+
+    monkeypatch.setattr(rate_limit.random, "random", lambda: 1.0)
+    bucket.acquire()
+    monkeypatch.setattr(rate_limit.random, "random", lambda: 0.0)
+    bucket.acquire()
+
+    # The stretched 1.1 s sleep refilled 0.1 token early, so the unjittered wait is 0.9 s.
+    assert clock.sleeps == pytest.approx([1.1, 0.9])